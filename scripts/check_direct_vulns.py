@@ -3,91 +3,167 @@
 
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
+import http.client
 import json
-import time
+import os
 import re
-import time
 import sys
-import urllib.error
-import urllib.request
+import threading
+import time
+import tomllib
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import aiohttp
+except ImportError:  # Optional; the threaded stdlib path below is used instead.
+    aiohttp = None
+
 ROOT = Path(__file__).resolve().parents[1]
 CATALOG = ROOT / "gradle" / "libs.versions.toml"
-GRADLE_FILES = sorted(
-    [p for p in ROOT.glob("**/build.gradle") if ".gradle/" not in p.as_posix()]
-    + [p for p in ROOT.glob("**/build.gradle.kts") if ".gradle/" not in p.as_posix()]
+# (group, artifact, version) of a Maven dependency.
+Coordinate = tuple[str, str, str]
+
+GRADLE_FILE_NAMES = {"build.gradle", "build.gradle.kts"}
+# Caches and build outputs can hold tens of thousands of directories; never descend into them.
+PRUNED_DIRS = {".gradle", "build", "node_modules", ".git", "out"}
+
+
+def find_gradle_files(root: Path) -> list[Path]:
+    found: list[Path] = []
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in PRUNED_DIRS]
+        found.extend(Path(dirpath) / name for name in files if name in GRADLE_FILE_NAMES)
+    return sorted(found)
+
+
+GRADLE_FILES = find_gradle_files(ROOT)
+OSV_HOST = "api.osv.dev"
+OSV_QUERYBATCH = "/v1/querybatch"
+OSV_VULN = "/v1/vulns/{}"
+OSV_BATCH_SIZE = 1000
+OSV_RETRIES = 5
+OSV_HYDRATE_WORKERS = 16
+OSV_CACHE_DIR = Path(os.environ.get("OSV_CACHE_DIR") or ROOT / ".cache" / "osv")
+OSV_CACHE_TTL = int(os.environ.get("OSV_CACHE_TTL", 24 * 60 * 60))
+OSV_ERRORS: tuple[type[BaseException], ...] = (http.client.HTTPException, OSError)
+if aiohttp is not None:
+    OSV_ERRORS += (aiohttp.ClientError,)
+OSV_ASYNC_CONNECTIONS = 32
+_VULN_CACHE: dict[str, dict] = {}
+# One keep-alive HTTPS connection per thread, so the TLS handshake is paid once
+# per worker instead of once per request.
+_OSV_LOCAL = threading.local()
+
+# One optional configuration prefix (test, debug, androidTest, ...) followed by the
+# declaration keyword, anchored on word boundaries so matching only starts at words.
+DEP_DECL_RE = rb"\b(?:[a-z][A-Za-z0-9]*)?(?:[Ii]mplementation|[Aa]pi|[Cc]ompileOnly|[Rr]untimeOnly)\b"
+# Cheap substring pre-check; every DEP_DECL_RE alternative contains one of these.
+NEEDLES = (b"mplementation", b"ompileOnly", b"untimeOnly", b"api", b"Api")
+# Build files are matched as bytes: every token of interest is ASCII, so only the
+# captured groups need decoding.
+DEP_RE = re.compile(
+    DEP_DECL_RE + rb"\s+(?:libs\.(?P<alias>[A-Za-z0-9_.]+)|['\"](?P<coord>[^'\"]+)['\"])"
 )
-GRADLE_FILES = list(ROOT.glob("**/build.gradle")) + list(ROOT.glob("**/build.gradle.kts"))
-OSV_QUERY = "https://api.osv.dev/v1/query"
-OSV_RETRIES = 3
-
-DEP_DECL_RE = r"(?:[A-Za-z][A-Za-z0-9]*(?:implementation|api|compileOnly|runtimeOnly)|implementation|api|compileOnly|runtimeOnly)"
-STRING_DEP_RE = re.compile(rf"{DEP_DECL_RE}\s+['\"]([^'\"]+)['\"]")
-ALIAS_DEP_RE = re.compile(rf"{DEP_DECL_RE}\s+libs\.([A-Za-z0-9_.]+)")
-LIB_DEF_RE = re.compile(r"^([A-Za-z0-9\-_.]+)\s*=\s*\{\s*module\s*=\s*\"([^\"]+)\"(?:,\s*version\.ref\s*=\s*\"([^\"]+)\")?\s*\}")
-VER_DEF_RE = re.compile(r"^([A-Za-z0-9\-_.]+)\s*=\s*\"([^\"]+)\"")
+_CVSS_NUM_RE = re.compile(r"(\d+(?:\.\d+)?)")
+_ALIAS_TABLE = str.maketrans("-_", "..")
+_ALIAS_DOTS_RE = re.compile(r"\.{2,}")
 
 
 def normalize_alias(alias: str) -> str:
-    return re.sub(r"[-_.]+", ".", alias)
+    # Same result as re.sub(r"[-_.]+", ".", alias); the regex is only needed for
+    # the rare alias with runs of separators.
+    alias = alias.translate(_ALIAS_TABLE)
+    if ".." in alias:
+        alias = _ALIAS_DOTS_RE.sub(".", alias)
+    return alias
+
+
+def _catalog_version(value: object, versions: dict) -> str | None:
+    if isinstance(value, str):
+        return value
+    if not isinstance(value, dict):
+        return None
+    if "ref" in value:
+        return _catalog_version(versions.get(value["ref"]), versions)
+    # Rich versions: `{ strictly = "..." }`, `{ require = "..." }`, ...
+    for key in ("strictly", "require", "prefer"):
+        if isinstance(value.get(key), str):
+            return value[key]
+    return None
 
 
 def load_catalog() -> dict[str, str]:
     if not CATALOG.exists():
         return {}
 
-    versions: dict[str, str] = {}
+    data = tomllib.loads(CATALOG.read_text())
+    versions = data.get("versions", {})
     libs: dict[str, str] = {}
-    section = None
 
-    for raw in CATALOG.read_text().splitlines():
-        line = raw.strip()
-        if not line or line.startswith("#"):
+    for alias, spec in data.get("libraries", {}).items():
+        if isinstance(spec, str):
+            libs[normalize_alias(alias)] = spec
             continue
-        if line.startswith("[") and line.endswith("]"):
-            section = line[1:-1]
+        if not isinstance(spec, dict):
             continue
-        if section == "versions":
-            m = VER_DEF_RE.match(line)
-            if m:
-                versions[m.group(1)] = m.group(2)
-        elif section == "libraries":
-            m = LIB_DEF_RE.match(line)
-            if m:
-                alias, module, version_ref = m.groups()
-                if version_ref and version_ref in versions:
-                    libs[normalize_alias(alias)] = f"{module}:{versions[version_ref]}"
-                else:
-                    libs[normalize_alias(alias)] = module
+        module = spec.get("module")
+        if not module and spec.get("group") and spec.get("name"):
+            module = f"{spec['group']}:{spec['name']}"
+        if not module:
+            continue
+        version = _catalog_version(spec.get("version"), versions)
+        libs[normalize_alias(alias)] = f"{module}:{version}" if version else module
 
     return libs
 
 
-def collect_direct_dependencies(alias_map: dict[str, str]) -> set[str]:
-    deps: set[str] = set()
+def collect_direct_dependencies(alias_map: dict[str, str]) -> set[Coordinate]:
+    deps: set[Coordinate] = set()
     for gradle_file in GRADLE_FILES:
-        if not gradle_file.exists():
+        try:
+            text = gradle_file.read_bytes()
+        except FileNotFoundError:
+            continue
+        if not any(needle in text for needle in NEEDLES):
             continue
-        text = gradle_file.read_text()
-        for dep in STRING_DEP_RE.findall(text):
-            parts = dep.split(":")
+        for match in DEP_RE.finditer(text):
+            alias = match["alias"]
+            if alias:
+                coordinate = alias_map.get(normalize_alias(alias.decode("ascii")), "")
+            else:
+                coordinate = match["coord"].decode("utf-8")
+            # Split once here; everything downstream works on the tuple.
+            parts = coordinate.split(":")
             if len(parts) >= 3:
-                deps.add(":".join(parts[:3]))
-        for alias in ALIAS_DEP_RE.findall(text):
-            resolved = alias_map.get(normalize_alias(alias))
-            if resolved and resolved.count(":") >= 2:
-                deps.add(resolved)
+                deps.add((parts[0], parts[1], parts[2]))
     return deps
 
 
-def _parse_cvss_score(value: object) -> float | None:
-    if value is None:
+def _parse_cvss_score(raw_score: object) -> float | None:
+    if raw_score is None:
         return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    text = str(value)
-    match = re.search(r"(\d+\.\d+|\d+)", text)
+    if isinstance(raw_score, (int, float)):
+        try:
+            return float(raw_score)
+        except (TypeError, ValueError):
+            return None
+
+    text = str(raw_score)
+    if text.upper().startswith("CVSS:"):
+        parts = text.split("/")
+        for part in parts:
+            if part.startswith("BASE:"):
+                try:
+                    return float(part.split(":", 1)[1])
+                except ValueError:
+                    break
+
+    match = _CVSS_NUM_RE.search(text)
     if not match:
         return None
     try:
@@ -97,73 +173,228 @@ def _parse_cvss_score(value: object) -> float | None:
 
 
 def is_critical(vuln: dict) -> bool:
-    def parse_cvss_score(raw_score: object) -> float | None:
-        if raw_score is None:
-            return None
-        if isinstance(raw_score, (int, float)):
-            try:
-                return float(raw_score)
-            except (TypeError, ValueError):
-                return None
-
-        text = str(raw_score)
-        if text.upper().startswith("CVSS:"):
-            parts = text.split("/")
-            for part in parts:
-                if part.startswith("BASE:"):
-                    try:
-                        return float(part.split(":", 1)[1])
-                    except ValueError:
-                        break
-
-        match = re.search(r"(\d+(?:\.\d+)?)", text)
-        if not match:
-            return None
-        try:
-            return float(match.group(1))
-        except ValueError:
-            return None
+    # Cheap string checks first; the typical GHSA record is decided by its label
+    # without ever reaching the numeric parser.
+    database_specific = vuln.get("database_specific", {}) or {}
+    if str(database_specific.get("severity", "")).upper() == "CRITICAL":
+        return True
 
-    sev = vuln.get("severity", [])
+    sev = vuln.get("severity", []) or []
     for item in sev:
-        score = item.get("score")
-        numeric_score = parse_cvss_score(score)
-        if numeric_score is not None and numeric_score >= 9.0:
+        text = str(item.get("score")).upper()
+        if "CRITICAL" in text or text.startswith(("9.", "10")):
             return True
-        if "CRITICAL" in str(score).upper():
+
+    for item in sev:
+        numeric_score = _parse_cvss_score(item.get("score"))
+        if numeric_score is not None and numeric_score >= 9.0:
             return True
 
-    database_specific = vuln.get("database_specific", {}) or {}
     cvss = database_specific.get("cvss", {})
     if isinstance(cvss, dict):
-        ds_score = parse_cvss_score(cvss.get("score"))
+        ds_score = _parse_cvss_score(cvss.get("score"))
         if ds_score is not None and ds_score >= 9.0:
             return True
 
-    return str(database_specific.get("severity", "")).upper() == "CRITICAL"
+    return False
+
+
+def _osv_connection() -> http.client.HTTPSConnection:
+    conn = getattr(_OSV_LOCAL, "conn", None)
+    if conn is None:
+        conn = _OSV_LOCAL.conn = http.client.HTTPSConnection(OSV_HOST, timeout=20)
+    return conn
 
 
-def osv_query(dep: str) -> list[dict]:
-    group, artifact, version = dep.split(":", 2)
-    payload = {
+def _osv_disconnect() -> None:
+    conn = getattr(_OSV_LOCAL, "conn", None)
+    if conn is not None:
+        conn.close()
+        _OSV_LOCAL.conn = None
+
+
+def _osv_request(method: str, path: str, payload: dict | None = None) -> dict:
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    # OSV JSON compresses well; http.client does not decompress on its own.
+    headers = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+
+    for attempt in range(1, OSV_RETRIES + 1):
+        try:
+            conn = _osv_connection()
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            if resp.will_close:
+                _osv_disconnect()
+            if resp.status != 200:
+                raise http.client.HTTPException(f"HTTP {resp.status} from {OSV_HOST}{path}")
+            if resp.getheader("Content-Encoding") == "gzip":
+                data = gzip.decompress(data)
+            return json.loads(data)
+        except OSV_ERRORS:
+            # The connection may be half-used; start the retry on a fresh one.
+            _osv_disconnect()
+            if attempt == OSV_RETRIES:
+                raise
+            time.sleep(2 ** (attempt - 1))
+    return {}
+
+
+def _package_query(dep: Coordinate) -> dict:
+    group, artifact, version = dep
+    return {
         "version": version,
         "package": {"name": f"{group}:{artifact}", "ecosystem": "Maven"},
     }
-    req = urllib.request.Request(
-        OSV_QUERY,
-        data=json.dumps(payload).encode("utf-8"),
-        headers={"Content-Type": "application/json"},
-    )
+
+
+def osv_fetch_vuln(vuln_id: str) -> dict:
+    return _osv_request("GET", OSV_VULN.format(urllib.parse.quote(vuln_id, safe="")))
+
+
+def _cache_path(dep: Coordinate) -> Path:
+    key = hashlib.sha1(":".join(dep).encode("utf-8")).hexdigest()
+    return OSV_CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def _cache_load(dep: Coordinate) -> list[dict] | None:
+    try:
+        entry = json.loads(_cache_path(dep).read_text())
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("fetched_at", 0) > OSV_CACHE_TTL:
+        return None
+    return entry.get("vulns", [])
+
+
+def _cache_store(dep: Coordinate, vulns: list[dict]) -> None:
+    path = _cache_path(dep)
+    tmp = path.with_suffix(".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"dep": ":".join(dep), "fetched_at": time.time(), "vulns": vulns}))
+        tmp.replace(path)
+    except OSError:
+        # The cache is an optimisation only; a read-only checkout still works.
+        pass
+
+
+def osv_query(deps: list[Coordinate]) -> list[list[dict]]:
+    """Return the hydrated OSV vulns for each dep, aligned by index with `deps`.
+
+    Entries younger than `OSV_CACHE_TTL` are served from `OSV_CACHE_DIR`; only
+    the misses go to the network.
+    """
+    cached = [_cache_load(dep) for dep in deps]
+    misses = [dep for dep, vulns in zip(deps, cached) if vulns is None]
+    fetched = iter(_osv_fetch(misses) if misses else [])
+
+    results: list[list[dict]] = []
+    for dep, vulns in zip(deps, cached):
+        if vulns is None:
+            vulns = next(fetched)
+            _cache_store(dep, vulns)
+        results.append(vulns)
+    return results
+
+
+def _osv_fetch(deps: list[Coordinate]) -> list[list[dict]]:
+    if aiohttp is not None:
+        return asyncio.run(_osv_fetch_async(deps))
+    return _osv_fetch_threaded(deps)
+
+
+def _osv_fetch_threaded(deps: list[Coordinate]) -> list[list[dict]]:
+    # `querybatch` only returns `{id, modified}` stubs, so every returned id is
+    # fetched from `/vulns/{id}` to get the severity fields `is_critical` needs.
+    vuln_ids: list[list[str]] = [[] for _ in deps]
+    pending = [(index, _package_query(dep)) for index, dep in enumerate(deps)]
+
+    while pending:
+        chunk, pending = pending[:OSV_BATCH_SIZE], pending[OSV_BATCH_SIZE:]
+        payload = {"queries": [query for _, query in chunk]}
+        results = _osv_request("POST", OSV_QUERYBATCH, payload).get("results", [])
+        for (index, query), result in zip(chunk, results):
+            vuln_ids[index].extend(vuln["id"] for vuln in result.get("vulns", []))
+            # Queries with more hits than fit in one response are paged.
+            page_token = result.get("next_page_token")
+            if page_token:
+                pending.append((index, {**query, "page_token": page_token}))
+
+    # Hydration GETs are independent and RTT-bound, so overlap them. The same
+    # advisory often covers several artifacts (e.g. room-runtime and room-ktx),
+    # so each id is fetched at most once per run.
+    missing = list(dict.fromkeys(
+        vuln_id for ids in vuln_ids for vuln_id in ids if vuln_id not in _VULN_CACHE
+    ))
+    with ThreadPoolExecutor(max_workers=OSV_HYDRATE_WORKERS) as executor:
+        _VULN_CACHE.update(zip(missing, executor.map(osv_fetch_vuln, missing)))
+    return [[_VULN_CACHE[vuln_id] for vuln_id in ids] for ids in vuln_ids]
+
+
+async def _osv_request_async(
+    session: aiohttp.ClientSession, method: str, path: str, payload: dict | None = None
+) -> dict:
     for attempt in range(1, OSV_RETRIES + 1):
         try:
-            with urllib.request.urlopen(req, timeout=20) as resp:  # nosec B310
-                data = json.loads(resp.read().decode("utf-8"))
-                return data.get("vulns", [])
-        except urllib.error.URLError:
+            async with session.request(method, f"https://{OSV_HOST}{path}", json=payload) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+        except OSV_ERRORS:
             if attempt == OSV_RETRIES:
                 raise
-            time.sleep(attempt)
-    return []
+            await asyncio.sleep(2 ** (attempt - 1))
+    return {}
+
+
+async def _osv_fetch_async(deps: list[Coordinate]) -> list[list[dict]]:
+    # Same contract as _osv_fetch_threaded, but every querybatch chunk runs
+    # concurrently and vuln hydration starts as soon as a chunk returns its ids
+    # instead of waiting for all batches to finish.
+    vuln_ids: list[list[str]] = [[] for _ in deps]
+    hydrations: dict[str, asyncio.Task] = {}
+    connector = aiohttp.TCPConnector(limit=OSV_ASYNC_CONNECTIONS)
+    timeout = aiohttp.ClientTimeout(total=20)
+
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, headers={"Accept": "application/json"}
+    ) as session:
+
+        async def run_batch(chunk: list[tuple[int, dict]]) -> None:
+            while chunk:
+                payload = {"queries": [query for _, query in chunk]}
+                data = await _osv_request_async(session, "POST", OSV_QUERYBATCH, payload)
+                paged: list[tuple[int, dict]] = []
+                for (index, query), result in zip(chunk, data.get("results", [])):
+                    for vuln in result.get("vulns", []):
+                        vuln_id = vuln["id"]
+                        vuln_ids[index].append(vuln_id)
+                        if vuln_id not in _VULN_CACHE and vuln_id not in hydrations:
+                            path = OSV_VULN.format(urllib.parse.quote(vuln_id, safe=""))
+                            hydrations[vuln_id] = asyncio.create_task(
+                                _osv_request_async(session, "GET", path)
+                            )
+                    page_token = result.get("next_page_token")
+                    if page_token:
+                        paged.append((index, {**query, "page_token": page_token}))
+                chunk = paged
+
+        pending = [(index, _package_query(dep)) for index, dep in enumerate(deps)]
+        try:
+            await asyncio.gather(*(
+                run_batch(pending[start:start + OSV_BATCH_SIZE])
+                for start in range(0, len(pending), OSV_BATCH_SIZE)
+            ))
+            vulns = await asyncio.gather(*hydrations.values())
+        except BaseException:
+            for task in hydrations.values():
+                task.cancel()
+            raise
+        _VULN_CACHE.update(zip(hydrations, vulns))
+
+    return [[_VULN_CACHE[vuln_id] for vuln_id in ids] for ids in vuln_ids]
 
 
 def main() -> int:
@@ -177,25 +408,16 @@ def main() -> int:
     print(f"Checking {len(direct_deps)} direct Maven dependencies against OSV...")
     critical_hits: list[tuple[str, str, str]] = []
 
-    for dep in direct_deps:
-        last_exc: urllib.error.URLError | None = None
-        vulns: list[dict] = []
-        for attempt in range(3):
-            try:
-                vulns = osv_query(dep)
-                last_exc = None
-                break
-            except urllib.error.URLError as exc:
-                last_exc = exc
-                if attempt < 2:
-                    time.sleep(1.5 * (attempt + 1))
-        if last_exc is not None:
-            print(f"ERROR: Could not query OSV for {dep} after retries: {last_exc}")
-            return 2
+    try:
+        results = osv_query(direct_deps)
+    except OSV_ERRORS as exc:
+        print(f"ERROR: Could not query OSV after {OSV_RETRIES} attempts: {exc}")
+        return 2
 
+    for dep, vulns in zip(direct_deps, results):
         for vuln in vulns:
             if is_critical(vuln):
-                critical_hits.append((dep, vuln.get("id", "UNKNOWN"), vuln.get("summary", "")))
+                critical_hits.append((":".join(dep), vuln.get("id", "UNKNOWN"), vuln.get("summary", "")))
 
     if critical_hits:
         print("\nCRITICAL vulnerabilities detected in direct dependencies:")
@@ -5,29 +5,65 @@ Parses YAML configuration and generates/updates Gradle build files
 """
 
 import os
+import re
 import sys
+import shutil
+import json
 import yaml
 import argparse
 import difflib
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+    HAS_LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+    HAS_LIBYAML = False
+
+# Gradle boolean literals, indexed by bool
+_BOOL_STR = ('false', 'true')
+
+
+def _gradle_bool(value):
+    """Format a YAML flag as a Gradle literal; non-bool values pass through as before"""
+    if value is True or value is False:
+        return _BOOL_STR[value]
+    return str(value).lower()
+
 
 class BuildConfigurator:
     """Parse YAML config and apply to Gradle build files"""
 
+    # Split, trim and non-empty checks for dependency entries in a single match
+    _NAME_VERSION_RE = re.compile(r'^\s*([^:\s]+)\s*:\s*([^:\s]+)\s*$')
+    _COORDINATE_RE = re.compile(r'^\s*([^:\s]+)\s*:\s*([^:\s]+)\s*:\s*([^:\s]+)\s*$')
+
+    # cleverferret androidx shorthands that do not live under androidx.<name>
+    _ANDROIDX_SPECIAL_CASES = {
+        'material': 'com.google.android.material:material',
+    }
+
     def __init__(self, config_file, yaml_format='auto'):
         self.config_file = Path(config_file)
         self.project_root = self.config_file.parent
         self.yaml_format = yaml_format
         self.config = None
+        self._include_kotlin_plugin = None
+        self._reset_derived_config()
+
+    def _reset_derived_config(self):
+        """Drop values derived from self.config so they are rebuilt on next access"""
+        self._app_config = None
+        self._build_types = None
+        self._dependencies = None
 
     def load_config(self):
         """Load and parse YAML configuration"""
         if not self.config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_file}")
 
-        with open(self.config_file, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = self._read_config()
 
         # Auto-detect format
         if self.yaml_format == 'auto':
@@ -38,155 +74,264 @@ class BuildConfigurator:
             else:
                 raise ValueError("Unknown YAML format")
 
+        # Resolve the per-format extractors once rather than branching on every call
+        if self.yaml_format == 'toolneuron':
+            self._extract_app_config = self._extract_app_config_toolneuron
+            self._extract_build_types = self._extract_build_types_toolneuron
+            self._extract_dependencies = self._extract_dependencies_toolneuron
+        else:  # cleverferret
+            self._extract_app_config = self._extract_app_config_cleverferret
+            self._extract_build_types = self._extract_build_types_cleverferret
+            self._extract_dependencies = self._extract_dependencies_cleverferret
+
+        self._reset_derived_config()
+
         print(f"[INFO] Loaded configuration from {self.config_file} (format: {self.yaml_format})")
         return self.config
 
+    def _read_config(self):
+        """Parse the YAML file, reusing its JSON sidecar cache when it is current"""
+        stat = self.config_file.stat()
+        cache_file = self.config_file.with_suffix(self.config_file.suffix + '.json.cache')
+
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = json.load(f)
+            if cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                return cached['config']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        if not HAS_LIBYAML:
+            print("[WARN] PyYAML was built without libyaml; using the slower pure-Python loader")
+
+        # Hand libyaml raw bytes; it decodes UTF-8 itself, so skip the text layer.
+        with open(self.config_file, 'rb', buffering=1 << 20) as f:
+            config = yaml.load(f, Loader=SafeLoader)
+
+        self._write_config_cache(cache_file, stat, config)
+        return config
+
+    @staticmethod
+    def _write_config_cache(cache_file, stat, config):
+        """Store parsed config as JSON; skipped when JSON cannot represent it exactly"""
+        try:
+            payload = json.dumps({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'config': config})
+        except (TypeError, ValueError):
+            return  # e.g. YAML timestamps
+        if json.loads(payload)['config'] != config:
+            return  # e.g. non-string mapping keys
+
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        try:
+            tmp_file.write_text(payload)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # The cache is optional; read-only checkouts still work
+
     def get_app_config(self):
         """Extract app configuration from YAML"""
-        if self.yaml_format == 'toolneuron':
-            return {
-                'name': self.config.get('app', {}).get('name', 'TronProtocol'),
-                'package': self.config.get('app', {}).get('package', 'com.tronprotocol.app'),
-                'version_code': self.config.get('version', {}).get('code', 1),
-                'version_name': self.config.get('version', {}).get('name', '1.0'),
-                'compile_sdk': self.config.get('build', {}).get('compile_sdk', 34),
-                'min_sdk': self.config.get('build', {}).get('min_sdk', 24),
-                'target_sdk': self.config.get('build', {}).get('target_sdk', 34),
-            }
-        else:  # cleverferret
-            return {
-                'name': self.config.get('project', {}).get('name', 'TronProtocol'),
-                'package': self.config.get('project', {}).get('id', 'com.tronprotocol.app'),
-                'version_code': self.config.get('versioning', {}).get('version_code', 1),
-                'version_name': self.config.get('versioning', {}).get('version_name', '1.0'),
-                'compile_sdk': self.config.get('android', {}).get('compileSdk', 34),
-                'min_sdk': self.config.get('android', {}).get('minSdk', 24),
-                'target_sdk': self.config.get('android', {}).get('targetSdk', 34),
-            }
+        if self._app_config is None:
+            self._app_config = self._extract_app_config()
+        return self._app_config
 
     def get_build_types(self):
         """Extract build type configurations"""
-        if self.yaml_format == 'toolneuron':
-            return self.config.get('build_types', {})
-        else:  # cleverferret
-            build_types = {}
-            for variant in self.config.get('variants', []):
-                variant_name = variant.get('name')
-                variant_config = variant.get('config', {})
-                build_types[variant_name] = {
-                    'enabled': True,
-                    'debuggable': variant_config.get('debuggable', False),
-                    'minify_enabled': variant_config.get('minifyEnabled', False),
-                    'shrink_resources': variant_config.get('shrinkResources', False),
-                    'output_name': variant.get('output', {}).get('name', f'TronProtocol-{variant_name}'),
-                }
-            return build_types
+        if self._build_types is None:
+            self._build_types = self._extract_build_types()
+        return self._build_types
 
     def get_dependencies(self):
         """Extract dependency list"""
-        if self.yaml_format == 'toolneuron':
-            deps = self.config.get('dependencies', [])
-            return [self._validate_dependency_coordinate(dep) for dep in deps]
+        if self._dependencies is None:
+            self._dependencies = self._extract_dependencies()
+        return self._dependencies
+
+    def _extract_app_config_toolneuron(self):
+        # Look each section up once; `or {}` only allocates when a section is missing
+        app = self.config.get('app') or {}
+        version = self.config.get('version') or {}
+        build = self.config.get('build') or {}
+        return {
+            'name': app.get('name', 'TronProtocol'),
+            'package': app.get('package', 'com.tronprotocol.app'),
+            'version_code': version.get('code', 1),
+            'version_name': version.get('name', '1.0'),
+            'compile_sdk': build.get('compile_sdk', 34),
+            'min_sdk': build.get('min_sdk', 24),
+            'target_sdk': build.get('target_sdk', 34),
+        }
+
+    def _extract_app_config_cleverferret(self):
+        project = self.config.get('project') or {}
+        versioning = self.config.get('versioning') or {}
+        android = self.config.get('android') or {}
+        return {
+            'name': project.get('name', 'TronProtocol'),
+            'package': project.get('id', 'com.tronprotocol.app'),
+            'version_code': versioning.get('version_code', 1),
+            'version_name': versioning.get('version_name', '1.0'),
+            'compile_sdk': android.get('compileSdk', 34),
+            'min_sdk': android.get('minSdk', 24),
+            'target_sdk': android.get('targetSdk', 34),
+        }
+
+    def _extract_build_types_toolneuron(self):
+        return self.config.get('build_types', {})
+
+    def _extract_build_types_cleverferret(self):
+        build_types = {}
+        for variant in self.config.get('variants', []):
+            variant_name = variant.get('name')
+            variant_config = variant.get('config') or {}
+            build_types[variant_name] = {
+                'enabled': True,
+                'debuggable': variant_config.get('debuggable', False),
+                'minify_enabled': variant_config.get('minifyEnabled', False),
+                'shrink_resources': variant_config.get('shrinkResources', False),
+                'output_name': (variant.get('output') or {}).get('name', f'TronProtocol-{variant_name}'),
+            }
+        return build_types
 
-        deps = []
+    def _extract_dependencies_toolneuron(self):
+        deps = self.config.get('dependencies', [])
+        return [self._validate_dependency_coordinate(dep) for dep in deps]
+
+    def _extract_dependencies_cleverferret(self):
         libraries = self.config.get('libraries', {})
+        parse = self._parse_name_version
 
         # Process androidx dependencies
-        for dep in libraries.get('androidx', []):
-            artifact, version = self._parse_name_version(dep, "libraries.androidx")
-            deps.append(self._convert_androidx_dependency(artifact, version))
+        deps = [
+            self._convert_androidx_dependency(*parse(dep, "libraries.androidx"))
+            for dep in libraries.get('androidx', ())
+        ]
 
         # Process google services
-        for dep in libraries.get('google_services', []):
-            artifact, version = self._parse_name_version(dep, "libraries.google_services")
-            deps.append(f'com.google.android.gms:{artifact}:{version}')
+        deps.extend(
+            'com.google.android.gms:%s:%s' % parse(dep, "libraries.google_services")
+            for dep in libraries.get('google_services', ())
+        )
 
         # Process tensorflow
-        for dep in libraries.get('tensorflow', []):
-            artifact, version = self._parse_name_version(dep, "libraries.tensorflow")
-            deps.append(f'org.tensorflow:{artifact}:{version}')
+        deps.extend(
+            'org.tensorflow:%s:%s' % parse(dep, "libraries.tensorflow")
+            for dep in libraries.get('tensorflow', ())
+        )
 
         return deps
 
-    @staticmethod
-    def _parse_name_version(entry, source):
+    @classmethod
+    def _parse_name_version(cls, entry, source):
         """Parse dependency entry in `name:version` form with validation."""
         if not isinstance(entry, str):
             raise ValueError(f"Malformed dependency in {source}: expected string, got {type(entry).__name__}")
 
-        parts = entry.split(':')
-        if len(parts) != 2:
-            raise ValueError(
-                f"Malformed dependency in {source}: '{entry}' (expected 'name:version')"
-            )
+        match = cls._NAME_VERSION_RE.match(entry)
+        if match:
+            return match.group(1), match.group(2)
 
-        name, version = (part.strip() for part in parts)
-        if not name or not version:
+        if entry.count(':') != 1:
             raise ValueError(
-                f"Malformed dependency in {source}: '{entry}' (name and version must be non-empty)"
+                f"Malformed dependency in {source}: '{entry}' (expected 'name:version')"
             )
-        return name, version
+        raise ValueError(
+            f"Malformed dependency in {source}: '{entry}' (name and version must be non-empty and contain no whitespace)"
+        )
 
-    @staticmethod
-    def _validate_dependency_coordinate(dep):
+    @classmethod
+    def _validate_dependency_coordinate(cls, dep):
         """Validate `group:artifact:version` dependency coordinates."""
         if not isinstance(dep, str):
             raise ValueError(f"Malformed dependency coordinate: expected string, got {type(dep).__name__}")
 
-        parts = dep.split(':')
-        if len(parts) != 3 or any(not part.strip() for part in parts):
+        if not cls._COORDINATE_RE.match(dep):
             raise ValueError(
                 f"Malformed dependency coordinate '{dep}' (expected 'group:artifact:version')"
             )
         return dep
 
-    @staticmethod
-    def _convert_androidx_dependency(artifact, version):
+    @classmethod
+    def _convert_androidx_dependency(cls, artifact, version):
         """Convert cleverferret androidx shorthand to full Maven coordinates."""
-        special_cases = {
-            'material': 'com.google.android.material:material',
-        }
-
-        if artifact in special_cases:
-            return f"{special_cases[artifact]}:{version}"
+        module = cls._ANDROIDX_SPECIAL_CASES.get(artifact)
+        if module is not None:
+            return f"{module}:{version}"
         return f"androidx.{artifact}:{artifact}:{version}"
 
     def should_include_kotlin_plugin(self):
         """Include Kotlin Android plugin when Kotlin sources are present."""
+        # Depends on the source tree rather than the YAML, so it survives reloads.
+        if self._include_kotlin_plugin is None:
+            self._include_kotlin_plugin = self._detect_kotlin_plugin()
+        return self._include_kotlin_plugin
+
+    def _detect_kotlin_plugin(self):
         app_dir = self.project_root / 'app'
-        kotlin_files = list(app_dir.glob('src/**/*.kt'))
-        if kotlin_files:
+        if self._contains_kotlin_source(app_dir / 'src'):
             return True
 
         existing_build_gradle = app_dir / 'build.gradle'
         if existing_build_gradle.exists():
-            content = existing_build_gradle.read_text()
-            if "id 'org.jetbrains.kotlin.android'" in content:
+            # A substring check needs no decoding; the plugin id is pure ASCII
+            content = existing_build_gradle.read_bytes()
+            if b"id 'org.jetbrains.kotlin.android'" in content:
                 return True
 
         return False
 
+    @classmethod
+    def _contains_kotlin_source(cls, directory):
+        """Return True on the first `.kt` file found, without walking the rest of the tree"""
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            return False
+
+        subdirs = []
+        with entries:
+            for entry in entries:
+                if entry.name.endswith('.kt') and entry.is_file():
+                    return True
+                # Hidden dirs (.gradle, ...) and build output never hold real sources
+                if entry.name.startswith('.') or entry.name == 'build':
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+        return any(cls._contains_kotlin_source(subdir) for subdir in subdirs)
+
     def generate_gradle_config(self, output_file=None):
         """Generate Gradle build configuration"""
         if output_file is None:
             output_file = self.project_root / 'app' / 'build.gradle.generated'
 
+        parts = self.render_gradle_config()
+
+        # Write fragments straight to the file; no need to join them first
+        with open(output_file, 'w', buffering=1 << 16) as f:
+            f.writelines(parts)
+
+        print(f"[SUCCESS] Generated Gradle configuration: {output_file}")
+        return output_file
+
+    def render_gradle_config(self):
+        """Render the Gradle build configuration as a list of text fragments"""
         app_config = self.get_app_config()
         build_types = self.get_build_types()
         dependencies = self.get_dependencies()
         include_kotlin_plugin = self.should_include_kotlin_plugin()
 
-        gradle_content = f"""// Auto-generated from {self.config_file.name}
+        parts = [f"""// Auto-generated from {self.config_file.name}
 // Do not edit manually - changes will be overwritten
 
 plugins {{
     id 'com.android.application'
-"""
+"""]
 
         if include_kotlin_plugin:
-            gradle_content += "    id 'org.jetbrains.kotlin.android'\n"
+            parts.append("    id 'org.jetbrains.kotlin.android'\n")
 
-        gradle_content += f"""}}
+        parts.append(f"""}}
 
 android {{
     namespace '{app_config['package']}'
@@ -201,7 +346,7 @@ android {{
     }}
 
     buildTypes {{
-"""
+""")
 
         if not build_types:
             build_types = {'release': {'enabled': True, 'minify_enabled': False}}
@@ -209,76 +354,75 @@ android {{
         # Add build types
         for build_type, config in build_types.items():
             if config.get('enabled', True):
-                gradle_content += f"""        {build_type} {{
-            debuggable {str(config.get('debuggable', False)).lower()}
-            minifyEnabled {str(config.get('minify_enabled', False)).lower()}
-"""
+                parts.append(f"""        {build_type} {{
+            debuggable {_gradle_bool(config.get('debuggable', False))}
+            minifyEnabled {_gradle_bool(config.get('minify_enabled', False))}
+""")
                 if config.get('shrink_resources'):
-                    gradle_content += "            shrinkResources true\n"
+                    parts.append("            shrinkResources true\n")
 
                 if config.get('proguard_files'):
                     files = config['proguard_files']
                     if isinstance(files, list):
-                        gradle_content += "            proguardFiles getDefaultProguardFile('proguard-android-optimize.txt')"
+                        parts.append("            proguardFiles getDefaultProguardFile('proguard-android-optimize.txt')")
                         for pf in files:
-                            gradle_content += f", '{pf}'"
-                        gradle_content += "\n"
+                            parts.append(f", '{pf}'")
+                        parts.append("\n")
                 elif build_type == 'release':
-                    gradle_content += (
+                    parts.append(
                         "            proguardFiles getDefaultProguardFile('proguard-android-optimize.txt'), "
                         "'proguard-rules.pro'\n"
                     )
 
-                gradle_content += "        }\n"
+                parts.append("        }\n")
 
-        gradle_content += """    }
+        parts.append("""    }
 
     compileOptions {
         sourceCompatibility JavaVersion.VERSION_1_8
         targetCompatibility JavaVersion.VERSION_1_8
     }
-"""
+""")
 
         if include_kotlin_plugin:
-            gradle_content += """
+            parts.append("""
     kotlinOptions {
         jvmTarget = '1.8'
     }
-"""
+""")
 
-        gradle_content += """
+        parts.append("""
 
 dependencies {
-"""
+""")
 
         # Add dependencies
         for dep in dependencies:
-            gradle_content += f"    implementation '{dep}'\n"
-
-        gradle_content += "}\n"
+            parts.append(f"    implementation '{dep}'\n")
 
-        # Write to file
-        with open(output_file, 'w') as f:
-            f.write(gradle_content)
-
-        print(f"[SUCCESS] Generated Gradle configuration: {output_file}")
-        return output_file
+        parts.append("}\n")
+        return parts
 
     def update_build_gradle(self, safe_update=False, force=False):
         """Update the actual app/build.gradle file"""
         build_gradle = self.project_root / 'app' / 'build.gradle'
 
-        # Generate to temporary file first
-        temp_file = self.generate_gradle_config()
+        # Render in memory; the diff and the update need no temporary file
+        generated_content = ''.join(self.render_gradle_config())
 
         if safe_update and build_gradle.exists():
-            current_content = build_gradle.read_text().splitlines(keepends=True)
-            generated_content = temp_file.read_text().splitlines(keepends=True)
+            current_content = build_gradle.read_text()
+            # Re-running the generator usually changes nothing; a plain string
+            # compare settles that without running the line diff
+            if current_content == generated_content:
+                print(f"[INFO] No changes to {build_gradle}")
+                return
+
             diff = list(difflib.unified_diff(
-                current_content,
-                generated_content,
+                current_content.splitlines(keepends=True),
+                generated_content.splitlines(keepends=True),
                 fromfile=str(build_gradle),
-                tofile=str(temp_file),
+                tofile=f"{build_gradle} (generated from {self.config_file.name})",
             ))
 
             if diff:
@@ -286,74 +430,79 @@ dependencies {
                 print(''.join(diff))
                 if not force:
                     print("[WARN] Destructive replacement prevented. Re-run with --force to apply.")
-                    temp_file.unlink()
                     return
 
         # Backup original
         backup_file = build_gradle.with_suffix('.gradle.backup')
         if build_gradle.exists():
-            import shutil
             shutil.copy(build_gradle, backup_file)
             print(f"[INFO] Backed up original build.gradle to {backup_file}")
 
-        # Copy generated to actual build.gradle
-        import shutil
-        shutil.copy(temp_file, build_gradle)
+        # Write next to the target and rename over it: one atomic syscall, so an
+        # interrupted run never leaves a truncated build.gradle behind
+        temp_file = build_gradle.with_suffix('.gradle.tmp')
+        temp_file.write_text(generated_content)
+        os.replace(temp_file, build_gradle)
         print(f"[SUCCESS] Updated {build_gradle}")
 
-        # Remove temp file
-        temp_file.unlink()
-
     def print_summary(self):
         """Print configuration summary"""
         app_config = self.get_app_config()
         build_types = self.get_build_types()
 
-        print("\n" + "=" * 60)
-        print("TronProtocol Build Configuration Summary")
-        print("=" * 60)
-        print(f"App Name:      {app_config['name']}")
-        print(f"Package:       {app_config['package']}")
-        print(f"Version:       {app_config['version_name']} ({app_config['version_code']})")
-        print(f"Compile SDK:   {app_config['compile_sdk']}")
-        print(f"Min SDK:       {app_config['min_sdk']}")
-        print(f"Target SDK:    {app_config['target_sdk']}")
-        print(f"\nBuild Types:   {', '.join(build_types.keys())}")
-        print("=" * 60 + "\n")
+        lines = [
+            "",
+            "=" * 60,
+            "TronProtocol Build Configuration Summary",
+            "=" * 60,
+            f"App Name:      {app_config['name']}",
+            f"Package:       {app_config['package']}",
+            f"Version:       {app_config['version_name']} ({app_config['version_code']})",
+            f"Compile SDK:   {app_config['compile_sdk']}",
+            f"Min SDK:       {app_config['min_sdk']}",
+            f"Target SDK:    {app_config['target_sdk']}",
+            "",
+            f"Build Types:   {', '.join(build_types.keys())}",
+            "=" * 60,
+            "",
+        ]
+        # One write instead of a print (and stdout lock) per line
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+# Expected dependency coordinates per bundled YAML file, checked by --self-check
+_SELF_CHECK_EXPECTED = (
+    ('toolneuron.yaml', (
+        'androidx.appcompat:appcompat:1.6.1',
+        'com.google.android.material:material:1.9.0',
+        'androidx.constraintlayout:constraintlayout:2.1.4',
+        'com.google.android.gms:play-services-mlkit-text-recognition:19.0.0',
+        'org.tensorflow:tensorflow-lite:2.13.0',
+        'org.tensorflow:tensorflow-lite-gpu:2.13.0',
+        'org.tensorflow:tensorflow-lite-support:0.4.4',
+        'com.google.android.gms:play-services-base:18.2.0',
+    )),
+    ('cleverferret.yaml', (
+        'androidx.appcompat:appcompat:1.6.1',
+        'com.google.android.material:material:1.9.0',
+        'androidx.constraintlayout:constraintlayout:2.1.4',
+        'com.google.android.gms:play-services-mlkit-text-recognition:19.0.0',
+        'com.google.android.gms:play-services-base:18.2.0',
+        'org.tensorflow:tensorflow-lite:2.13.0',
+        'org.tensorflow:tensorflow-lite-gpu:2.13.0',
+        'org.tensorflow:tensorflow-lite-support:0.4.4',
+    )),
+)
 
 
 def run_self_check():
     """Validate dependency coordinate generation for known YAML formats."""
-    expected = {
-        'toolneuron.yaml': [
-            'androidx.appcompat:appcompat:1.6.1',
-            'com.google.android.material:material:1.9.0',
-            'androidx.constraintlayout:constraintlayout:2.1.4',
-            'com.google.android.gms:play-services-mlkit-text-recognition:19.0.0',
-            'org.tensorflow:tensorflow-lite:2.13.0',
-            'org.tensorflow:tensorflow-lite-gpu:2.13.0',
-            'org.tensorflow:tensorflow-lite-support:0.4.4',
-            'com.google.android.gms:play-services-base:18.2.0',
-        ],
-        'cleverferret.yaml': [
-            'androidx.appcompat:appcompat:1.6.1',
-            'com.google.android.material:material:1.9.0',
-            'androidx.constraintlayout:constraintlayout:2.1.4',
-            'com.google.android.gms:play-services-mlkit-text-recognition:19.0.0',
-            'com.google.android.gms:play-services-base:18.2.0',
-            'org.tensorflow:tensorflow-lite:2.13.0',
-            'org.tensorflow:tensorflow-lite-gpu:2.13.0',
-            'org.tensorflow:tensorflow-lite-support:0.4.4',
-        ],
-    }
-
-    for file_name, expected_deps in expected.items():
+    for file_name, expected_deps in _SELF_CHECK_EXPECTED:
         configurator = BuildConfigurator(file_name)
         configurator.load_config()
         actual = configurator.get_dependencies()
-        if actual != expected_deps:
+        if tuple(actual) != expected_deps:
             raise AssertionError(
-                f"Dependency self-check failed for {file_name}\nExpected: {expected_deps}\nActual:   {actual}"
+                f"Dependency self-check failed for {file_name}\nExpected: {list(expected_deps)}\nActual:   {actual}"
             )
 
     print("[SUCCESS] Dependency self-check passed for toolneuron.yaml and cleverferret.yaml")